@@ -0,0 +1,87 @@
+import streamlit as st
+from squid.backend import backend_id, backend_kind
+from squid.source import get_store
+from squid.telemetry import CAPACITY, calls, clear, queries
+from squid.warehouse import read_pandas
+
+# --- Page Config ------------------------------------------------------------------------------------------------------
+# Not linked from the sidebar (every page hides it); open it by URL: /Diagnostics
+st.set_page_config(
+    page_title="Axelar's Squid Bridge",
+    page_icon="https://pbs.twimg.com/profile_images/1938625911743524864/ppNPPF84_400x400.jpg",
+    layout="wide"
+)
+
+st.title("🩺Diagnostics")
+
+st.info(f"🔎Loader telemetry of this server process: the most recent {CAPACITY:,} loader calls and backend queries. Backend: `{backend_id()}`.")
+
+df_calls = calls()
+df_queries = queries()
+
+if st.button("Clear telemetry"):
+    clear()
+    st.rerun()
+
+if df_calls.empty:
+    st.warning("No loader calls recorded yet. Open a dashboard page first.")
+    st.stop()
+
+# --- Percentiles ------------------------------------------------------------------------------------------------------
+def p50(values):
+    return values.quantile(0.5)
+
+def p95(values):
+    return values.quantile(0.95)
+
+def summarize(df, keys):
+    return df.groupby(keys, as_index=False, dropna=False).agg(**{
+        "Calls": ("Loader", "size"),
+        "Hit Rate": ("Cache Hit", "mean"),
+        "Wall p50 (s)": ("Wall (s)", p50),
+        "Wall p95 (s)": ("Wall (s)", p95),
+        "Fetch p50 (s)": ("Fetch (s)", p50),
+        "Fetch p95 (s)": ("Fetch (s)", p95),
+        "Rows p50": ("Rows", p50),
+        "MB Fetched": ("Bytes Fetched", lambda b: b.sum() / 1e6),
+    }).sort_values("Wall p95 (s)", ascending=False, ignore_index=True)
+
+# --- KPIs -------------------------------------------------------------------------------------------------------------
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Loader Calls", f"{len(df_calls):,}")
+col2.metric("Cache Hit Rate", f"{df_calls['Cache Hit'].mean():.0%}")
+col3.metric("Backend Queries", f"{len(df_queries):,}")
+col4.metric("Query Time", f"{df_queries['Seconds'].sum():,.1f}s")
+
+# --- Per Page ---------------------------------------------------------------------------------------------------------
+# Top-level calls only; a page's loaders run concurrently, so its load time is roughly its slowest loader.
+st.subheader("Per Page")
+st.dataframe(summarize(df_calls[df_calls["Caller"].isna()], ["Page"]).round(3), use_container_width=True, hide_index=True)
+
+# --- Per Loader -------------------------------------------------------------------------------------------------------
+# Fetch time of a loader includes the queries of the loaders it calls.
+st.subheader("Per Loader")
+st.dataframe(summarize(df_calls, ["Page", "Loader"]).round(3), use_container_width=True, hide_index=True)
+
+# --- Slowest Recent Queries -------------------------------------------------------------------------------------------
+st.subheader("Slowest Recent Queries")
+df_slow = df_queries.sort_values("Seconds", ascending=False, ignore_index=True).head(25)
+
+# Bytes scanned are only known to Snowflake; the app's queries share one session, so its history has them.
+if backend_kind() == "snowflake" and get_store() is None and df_slow["Query ID"].notna().any() and st.button("Look up bytes scanned"):
+    ids = df_slow["Query ID"].dropna().tolist()
+    history = read_pandas(
+        f"""
+        SELECT query_id AS "Query ID", bytes_scanned AS "Bytes Scanned", total_elapsed_time / 1000 AS "Warehouse (s)"
+        FROM TABLE(axelar.information_schema.query_history_by_session(RESULT_LIMIT => 10000))
+        WHERE query_id IN ({", ".join("?" for _ in ids)})
+        """,
+        ids,
+    )
+    df_slow = df_slow.merge(history, on="Query ID", how="left")
+
+st.dataframe(df_slow.round({"Seconds": 3}), use_container_width=True, hide_index=True)
+
+# --- Recent Calls -----------------------------------------------------------------------------------------------------
+st.subheader("Recent Loader Calls")
+st.dataframe(df_calls.sort_values("At", ascending=False, ignore_index=True).head(200).round({"Wall (s)": 3, "Fetch (s)": 3}), use_container_width=True, hide_index=True)
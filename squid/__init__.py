@@ -0,0 +1 @@
+# --- Shared data-access layer for the Squid Bridge dashboard pages -----------------------------------------------------
@@ -0,0 +1,46 @@
+# --- Asset Dimension ----------------------------------------------------------------------------------------------------
+# Raw Axelar denoms -> display symbol, decimals and canonical family, kept in `data/assets.csv` and loaded once per
+# process. A `raw_asset` ending in `*` is a case-insensitive prefix rule (e.g. `factory/sei10hub*`). Loaders group by
+# `raw_asset` on the server and map to symbols client-side; distinct users are merged per symbol from sketches.
+import csv
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+ASSETS_PATH = os.path.join(os.path.dirname(__file__), "data", "assets.csv")
+
+
+@lru_cache(maxsize=None)
+def load_assets(path=ASSETS_PATH):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assets = pd.DataFrame(rows, columns=["raw_asset", "symbol", "decimals", "family"])
+    return assets.astype({"decimals": "int64"})
+
+
+def _rules():
+    assets = load_assets()
+    prefix = assets["raw_asset"].str.endswith("*")
+    exact = dict(zip(assets.loc[~prefix, "raw_asset"], assets.loc[~prefix, "symbol"]))
+    prefixes = [(raw[:-1].lower(), symbol) for raw, symbol in zip(assets.loc[prefix, "raw_asset"], assets.loc[prefix, "symbol"])]
+    return exact, prefixes
+
+
+# --- Client-Side Mapping ------------------------------------------------------------------------------------------------
+def to_symbol(raw_assets):
+    # Unknown denoms fall through as-is, like the `ELSE raw_asset` arm of the old inline CASE.
+    exact, prefixes = _rules()
+    symbols = raw_assets.map(exact)
+    if prefixes:
+        lowered = raw_assets.str.lower()
+        for prefix, symbol in prefixes:
+            symbols = symbols.mask(symbols.isna() & lowered.str.startswith(prefix, na=False), symbol)
+    return symbols.fillna(raw_assets)
+
+
+def by_symbol(df, keys=(), symbol_column="Symbol", raw_column="raw_asset"):
+    # Rolls measures grouped per raw denom up to their symbol; several denoms can share one (SEILOR), so every
+    # non-key column is summed and must be additive.
+    df = df.assign(**{symbol_column: to_symbol(df[raw_column])}).drop(columns=raw_column)
+    return df.groupby([*keys, symbol_column], as_index=False, sort=False, dropna=False).sum()
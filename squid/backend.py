@@ -0,0 +1,61 @@
+# --- Query Backend ------------------------------------------------------------------------------------------------------
+# Loader SQL is written in Snowflake dialect and runs on whichever backend secrets select:
+#
+#   [backend]
+#   kind = "snowflake"                        # default: the Axelscan fact tables in Snowflake (`squid.connection`)
+#
+#   [backend]
+#   kind = "duckdb"
+#   parquet = "data/snapshot"                 # fact_transfers.parquet + fact_gmp.parquet (`squid.snapshot`,
+#                                             # `squid.synthetic`), queried through `squid.local_warehouse`
+#
+# A backend is anything whose `cursor()` behaves like a Snowflake cursor for the calls `squid.warehouse` makes, so
+# pages, the local store's sync and the warm-up run unchanged on either one, without spending warehouse credits.
+import streamlit as st
+
+from squid.connection import get_connection
+from squid.local_warehouse import LocalWarehouse
+
+DEFAULT_PARQUET = "data/snapshot"
+
+# Replaces the configured backend for the whole process when set, e.g. by the offline benchmark (`squid.bench`).
+_override = {"backend": None}
+
+
+def use_backend(backend):
+    # None restores the backend configured in secrets.
+    _override["backend"] = backend
+
+
+def backend_settings():
+    return st.secrets.get("backend") or {}
+
+
+def backend_kind():
+    if _override["backend"] is not None:
+        return "override"
+    return backend_settings().get("kind", "snowflake")
+
+
+def backend_id():
+    # Identifies the data a query result came from, for keys of results that outlive the process.
+    kind = backend_kind()
+    if kind == "duckdb":
+        return f"duckdb:{backend_settings().get('parquet', DEFAULT_PARQUET)}"
+    return kind
+
+
+@st.cache_resource(show_spinner=False)
+def _duckdb_backend(parquet_dir):
+    return LocalWarehouse(parquet_dir=parquet_dir)
+
+
+def get_backend():
+    if _override["backend"] is not None:
+        return _override["backend"]
+    kind = backend_kind()
+    if kind == "snowflake":
+        return get_connection()
+    if kind == "duckdb":
+        return _duckdb_backend(backend_settings().get("parquet", DEFAULT_PARQUET))
+    raise ValueError(f"Unknown backend kind {kind!r} in secrets [backend]; expected 'snowflake' or 'duckdb'.")
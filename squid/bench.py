@@ -0,0 +1,133 @@
+# --- Offline Benchmark --------------------------------------------------------------------------------------------------
+# Runs every dashboard page against a local stand-in for the Snowflake fact tables (`squid.local_warehouse`) over
+# seeded synthetic Parquet (`squid.synthetic`), at one or more data scales, with no network. Each page is run cold
+# (all caches cleared) and then warm, through Streamlit's headless test runner, so the exact loader set the page
+# submits is measured; the per-loader breakdown comes from `squid.telemetry`. Every page runs in a process of its
+# own, so its peak RSS (DuckDB's native memory included) is that page's and not the benchmark's so far.
+#
+# Usage:  python -m squid.bench [rows ...] [--seed N] [--json results.json]      (default: 100000 rows)
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from squid import telemetry
+from squid.backend import use_backend
+from squid.local_warehouse import LocalWarehouse
+from squid.synthetic import generate
+
+# `ru_maxrss` is in KiB on Linux and in bytes on macOS.
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages")
+TIMEOUT = 1800
+
+
+def _pages():
+    return [p for p in sorted(glob.glob(os.path.join(PAGES_DIR, "*.py"))) if "Diagnostics" not in p]
+
+
+def _run(page):
+    at = AppTest.from_file(page, default_timeout=TIMEOUT)
+    # Warehouse mode without the on-disk result cache, so a cold run really scans.
+    at.secrets["cache"] = {"enabled": False}
+    started = time.perf_counter()
+    at.run()
+    return at, time.perf_counter() - started
+
+
+def bench_scale(rows, seed=0):
+    with tempfile.TemporaryDirectory(prefix="squid-bench-") as directory:
+        started = time.perf_counter()
+        generate(directory, rows, seed)
+        print(f"\n{rows:,} raw rows generated in {time.perf_counter() - started:.1f}s")
+        page_rows, loader_rows = [], []
+        for page in _pages():
+            out = os.path.join(directory, "result.json")
+            command = [sys.executable, "-m", "squid.bench", str(rows), "--page", page, "--parquet", directory, "--out", out]
+            subprocess.run(command, check=True)
+            with open(out) as f:
+                result = json.load(f)
+            page_rows.append(result["page"])
+            loader_rows += result["loaders"]
+        return page_rows, loader_rows
+
+
+def _bench_page(parquet_dir, page, rows):
+    # Runs in a fresh process (see `bench_scale`), so every cache starts empty and `ru_maxrss` is this page's peak.
+    warehouse = LocalWarehouse(parquet_dir=parquet_dir)
+    use_backend(warehouse)
+    try:
+        name = os.path.splitext(os.path.basename(page))[0]
+        at, cold = _run(page)
+        cold_calls = telemetry.calls()
+        at.run()
+        warm = telemetry.calls().iloc[len(cold_calls):]["Wall (s)"].max()
+        page_row = {
+            "Rows": rows,
+            "Page": name,
+            "Cold (s)": cold,
+            "Warm Loader Max (s)": warm,
+            "Events/s": rows / cold,
+            "Queries": len(telemetry.queries()),
+            "Peak RSS (MB)": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT / 1024 ** 2,
+            "Errors": len(at.exception),
+        }
+        loader_rows = [
+            {
+                "Rows": rows, "Page": name, "Loader": call["Loader"], "Caller": call["Caller"],
+                "Wall (s)": call["Wall (s)"], "Fetch (s)": call["Fetch (s)"], "Result Rows": call["Rows"],
+            }
+            for call in cold_calls.to_dict("records")
+        ]
+    finally:
+        use_backend(None)
+        warehouse.close()
+    return page_row, loader_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m squid.bench", description="Offline page benchmark.")
+    parser.add_argument("rows", nargs="*", type=int, default=[100_000], help="raw fact-table rows per scale")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    # Internal: run one page against an existing snapshot and write its results to `--out`.
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    parser.add_argument("--parquet", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.page:
+        page_row, loader_rows = _bench_page(args.parquet, args.page, args.rows[0])
+        with open(args.out, "w") as f:
+            json.dump({"page": page_row, "loaders": loader_rows}, f, default=str)
+        return 0
+
+    pages, loaders = [], []
+    for rows in args.rows:
+        page_rows, loader_rows = bench_scale(rows, args.seed)
+        pages += page_rows
+        loaders += loader_rows
+    pages, loaders = pd.DataFrame(pages), pd.DataFrame(loaders)
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20, "display.float_format", "{:,.3f}".format):
+        print("\n--- Pages (cold) ---")
+        print(pages.to_string(index=False))
+        print("\n--- Slowest cold loaders ---")
+        print(loaders.sort_values("Wall (s)", ascending=False).head(15).to_string(index=False))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"pages": pages.to_dict("records"), "loaders": loaders.to_dict("records")}, f, indent=2, default=str)
+    return 1 if pages["Errors"].any() else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+# --- Chart Layer for Long Time Series -----------------------------------------------------------------------------------
+# A day-timeframe chart over the default range has ~1,000 points per trace, and several SVG figures of that size
+# (bubble charts with a per-point `size` above all) stall the browser. Traces are therefore thinned on the server
+# before they are sent: lines and markers with LTTB (Largest-Triangle-Three-Buckets), which keeps the points that
+# shape the curve, and bars with min-max per bucket, which keeps every spike. Whatever is still above
+# `WEBGL_POINTS` renders with WebGL (`Scattergl`).
+#
+# Streamlit does not report Plotly's client-side zoom back to the server, so zooming goes through a box selection
+# instead: dragging across a chart reruns the page with only that date window, which then fits the point budget and
+# renders at full resolution; double-clicking clears the selection and returns to the overview.
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+# Most points sent per trace.
+MAX_POINTS = 500
+
+# Marker traces with more points than this use WebGL.
+WEBGL_POINTS = 300
+
+ZOOM_HINT = "🔍Drag across a chart to zoom into that window at full resolution; double-click to reset."
+
+
+# --- Downsampling -------------------------------------------------------------------------------------------------------
+def _numeric(values):
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isfinite(values), values, 0.0)
+
+
+def lttb(x, y, n):
+    # Positions of the `n` points LTTB keeps (always the first and the last); all of them when `n` covers the series.
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x, y = _numeric(x), _numeric(y)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    keep = [0]
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else slice(size - 1, size)
+        ax, ay = x[keep[-1]], y[keep[-1]]
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        keep.append(lo + int(area.argmax()))
+    keep.append(size - 1)
+    return np.asarray(keep)
+
+
+def minmax(y, n):
+    # Positions of the smallest and largest value in each of `(n - 2) // 2` buckets, plus the first and the last.
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    y = _numeric(y)
+    keep = {0, size - 1}
+    for bucket in np.array_split(np.arange(size), max((n - 2) // 2, 1)):
+        keep.update((bucket[y[bucket].argmin()], bucket[y[bucket].argmax()]))
+    return np.asarray(sorted(keep))
+
+
+def _days(dates):
+    dates = pd.to_datetime(pd.Series(dates))
+    return (dates - dates.min()).dt.total_seconds().to_numpy() / 86400
+
+
+def thin(df, x, y, method="lttb", max_points=MAX_POINTS):
+    # Rows of `df` (sorted by `x`) to plot for column `y`.
+    if len(df) <= max_points:
+        return df
+    positions = lttb(_days(df[x]), df[y], max_points) if method == "lttb" else minmax(df[y], max_points)
+    return df.iloc[positions]
+
+
+# --- Traces -------------------------------------------------------------------------------------------------------------
+def render_mode(points):
+    # For `px.scatter(..., render_mode=...)`.
+    return "webgl" if points > WEBGL_POINTS else "svg"
+
+
+def bar(df, x, y, **kwargs):
+    rows = thin(df, x, y, "minmax")
+    return go.Bar(x=rows[x], y=rows[y], **kwargs)
+
+
+def scatter(df, x, y, **kwargs):
+    rows = thin(df, x, y)
+    trace = go.Scattergl if len(rows) > WEBGL_POINTS else go.Scatter
+    return trace(x=rows[x], y=rows[y], **kwargs)
+
+
+# --- Zoom ---------------------------------------------------------------------------------------------------------------
+def zoom_window(df, x, key):
+    # Rows inside the date window box-selected on the chart drawn with `show(fig, key)`, else all of them.
+    event = st.session_state.get(key)
+    boxes = (event or {}).get("selection", {}).get("box") or []
+    if not boxes or "x" not in boxes[0]:
+        return df
+    # Plotly reports the box edges as date strings with or without a time part.
+    start, end = sorted(pd.Timestamp(edge) for edge in boxes[0]["x"])
+    dates = pd.to_datetime(df[x])
+    window = df[(dates >= start) & (dates <= end)]
+    return window if not window.empty else df
+
+
+def show(fig, key):
+    st.plotly_chart(fig, use_container_width=True, key=key, on_select="rerun", selection_mode="box")
@@ -0,0 +1,30 @@
+# --- Squid Contract Registry --------------------------------------------------------------------------------------------
+# Squid router contracts live in `data/squid_contracts.csv` (address, label, `;`-separated chains; an empty chain
+# list means the contract is deployed on several chains). Events are matched by exact, lower-cased address, so
+# adding a contract is a one-line data change.
+import csv
+import os
+import re
+from functools import lru_cache
+
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), "data", "squid_contracts.csv")
+
+_ADDRESS = re.compile(r"^0x[0-9a-f]{40}$")
+
+
+@lru_cache(maxsize=None)
+def load_contracts(path=REGISTRY_PATH):
+    contracts = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            address = row["address"].strip().lower()
+            # Addresses are inlined into the event SQL, so only well-formed EVM addresses are accepted.
+            if not _ADDRESS.match(address):
+                raise ValueError(f"Invalid contract address in {path}: {row['address']!r}")
+            chains = tuple(c.strip().lower() for c in row["chains"].split(";") if c.strip())
+            contracts.append({"address": address, "label": row["label"].strip(), "chains": chains})
+    return tuple(contracts)
+
+
+def contract_addresses():
+    return [c["address"] for c in load_contracts()]
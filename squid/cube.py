@@ -0,0 +1,96 @@
+# --- Analytics Cube -----------------------------------------------------------------------------------------------------
+# Every page slices the same facts, so they are aggregated once per day at exactly the grains the pages read: one
+# relation of additive measures per grain in `MEASURE_GRAINS`, and one of HLL user registers (see `squid.sketches`)
+# per grain in `USER_GRAINS`. A finer common grain would serve every page from one relation, but crossing chains,
+# routes, assets and size bands per day leaves almost one row per event, which is no cheaper than the events.
+# The local store materializes each relation as a table during `sync`; without a store they are built from the
+# warehouse day by day (`squid.source.load_cube`). Page loaders are a filter plus a group-by over these rows.
+from squid.sketches import sketch_query
+
+DATE = "date_trunc('day', created_at)"
+
+SIZE_BAND = """CASE
+          WHEN amount_usd<=10 THEN '<=$10'
+          WHEN amount_usd>10 AND amount_usd<=100 THEN '$10-$100'
+          WHEN amount_usd>100 AND amount_usd<=1000 THEN '$100-$1K'
+          WHEN amount_usd>1000 AND amount_usd<=10000 THEN '$1K-$10K'
+          WHEN amount_usd>10000 AND amount_usd<=100000 THEN '$10K-$100K'
+          WHEN amount_usd>100000 THEN '>$100K'
+        END"""
+
+# Keys besides "Date" and what they are selected as.
+_KEYS = {
+    "source_chain": "source_chain",
+    "destination_chain": "destination_chain",
+    "raw_asset": "raw_asset",
+    "Bridge Size": SIZE_BAND,
+}
+
+# Measure relations: grain name -> keys.
+MEASURE_GRAINS = {
+    "assets": ["raw_asset"],                                # Overall Stats (summed per day), By Assets
+    "sizes": ["raw_asset", "Bridge Size"],                  # By Assets size mix
+    "routes": ["source_chain", "destination_chain"],        # By Routes
+    "source_assets": ["source_chain", "raw_asset"],         # Specific Chain, source side
+    "destination_assets": ["destination_chain", "raw_asset"],
+}
+
+# User sketch relations: grain name -> keys.
+USER_GRAINS = {
+    "daily": [],                                            # Overall Stats
+    "assets": ["raw_asset"],                                # By Assets
+    "routes": ["source_chain", "destination_chain"],        # By Routes
+    "sources": ["source_chain"],                            # Specific Chain
+    "destinations": ["destination_chain"],
+}
+
+MEASURES = {
+    "Bridges": "COUNT(DISTINCT id)",
+    "Volume USD": "SUM(amount_usd)",
+    "Priced Bridges": "COUNT(amount_usd)",
+    "Fee": "SUM(fee)",
+}
+
+CUBE_COLUMNS = ["created_at", "id", "user", "source_chain", "destination_chain", "raw_asset", "amount_usd", "fee"]
+
+
+def _keys(names):
+    return {"Date": DATE, **{name: _KEYS[name] for name in names}}
+
+
+def cube_query(grain, source="axelar_service", where=""):
+    # `where` is an optional condition on the event rows, e.g. the re-synced tail of the local store.
+    keys = _keys(MEASURE_GRAINS[grain])
+    selected = ",\n        ".join(f'{expression} AS "{name}"' for name, expression in keys.items())
+    measures = ",\n        ".join(f'{expression} AS "{name}"' for name, expression in MEASURES.items())
+    return f"""
+    SELECT
+        {selected},
+        {measures}
+    FROM {source}
+    {f"WHERE {where}" if where else ""}
+    GROUP BY {", ".join(str(i) for i in range(1, len(keys) + 1))}
+    """
+
+
+def cube_users_query(grain, source="axelar_service", where=""):
+    return sketch_query(_keys(USER_GRAINS[grain]), source=source, where=f"AND {where}" if where else "")
+
+
+def cube_table(grain):
+    return f"squid_cube_{grain}"
+
+
+def users_table(grain):
+    return f"squid_users_{grain}"
+
+
+# --- Client-Side Helpers ------------------------------------------------------------------------------------------------
+def route(cube):
+    # Same as `source_chain || '➡' || destination_chain`: missing when either side is.
+    return cube["source_chain"] + "➡" + cube["destination_chain"]
+
+
+def totals(cube, keys):
+    # Additive measures summed per `keys`.
+    return cube.groupby(list(keys), as_index=False, sort=False, dropna=False)[list(MEASURES)].sum()
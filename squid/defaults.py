@@ -0,0 +1,15 @@
+# --- Default Views ------------------------------------------------------------------------------------------------------
+# Date ranges the pages open with. Nearly every first view hits one of these, so `squid.warmup` precomputes them
+# before a deploy takes traffic; keep the pages' date inputs pointed here.
+from datetime import date
+
+DEFAULT_START = date(2023, 1, 1)
+DEFAULT_END = date(2025, 8, 31)
+ROUTES_DEFAULT_END = date(2025, 7, 31)
+
+DEFAULT_RANGES = {
+    "Overall Stats": (DEFAULT_START, DEFAULT_END),
+    "By Routes": (DEFAULT_START, ROUTES_DEFAULT_END),
+    "By Assets": (DEFAULT_START, DEFAULT_END),
+    "Specific Chain": (DEFAULT_START, DEFAULT_END),
+}
@@ -0,0 +1,121 @@
+# --- Normalized Squid Event Relation ------------------------------------------------------------------------------------
+# Single definition of the `axelar_service` CTE shared by every page: Squid token transfers from
+# `fact_transfers` unioned with Squid GMP calls from `fact_gmp`, projected onto one column set with
+# lower-cased chain names and typed amount / fee values. Pages only state their aggregation on top.
+#
+# With `ranged=True` every branch also filters `created_at >= %(start)s AND created_at < %(end)s` on the raw
+# timestamp, so micro-partition pruning applies to both fact tables (see `squid.sql.date_range`).
+
+from squid.contracts import contract_addresses
+
+EVENT_COLUMNS = [
+    "created_at", "id", "user", "source_chain", "destination_chain",
+    "service", "raw_asset", "amount", "amount_usd", "fee",
+]
+
+# A row belongs to Squid when its sender (transfers) or approved contract (GMP) is in the contract registry.
+_TRANSFER_CONTRACT = "LOWER(sender_address)"
+_GMP_CONTRACT = "LOWER(data:approved:returnValues:contractAddress::STRING)"
+
+
+def _to_double(path):
+    # VARIANT values are sometimes arrays/objects where a number is expected; those become NULL.
+    return f"CASE WHEN IS_ARRAY({path}) OR IS_OBJECT({path}) THEN NULL ELSE TRY_TO_DOUBLE({path}::STRING) END"
+
+
+_TRANSFER_COLUMNS = {
+    "created_at": "created_at",
+    "id": "id",
+    "user": "recipient_address",
+    "source_chain": "LOWER(data:send:original_source_chain::STRING)",
+    "destination_chain": "LOWER(data:send:original_destination_chain::STRING)",
+    "service": "'Token Transfers'",
+    "raw_asset": "data:link:asset::STRING",
+    "amount": _to_double("data:send:amount"),
+    "amount_usd": f"({_to_double('data:send:amount')}) * ({_to_double('data:link:price')})",
+    "fee": _to_double("data:send:fee_value"),
+}
+
+_GMP_COLUMNS = {
+    "created_at": "created_at",
+    "id": "id",
+    "user": "data:call.transaction.from::STRING",
+    "source_chain": "LOWER(data:call.chain::STRING)",
+    "destination_chain": "LOWER(data:call.returnValues.destinationChain::STRING)",
+    "service": "'GMP'",
+    "raw_asset": "data:symbol::STRING",
+    "amount": _to_double("data:amount"),
+    "amount_usd": _to_double("data:value"),
+    "fee": (
+        f"COALESCE(({_to_double('data:gas:gas_used_amount')}) * "
+        f"({_to_double('data:gas_price_rate:source_token.token_price.usd')}), "
+        f"{_to_double('data:fees:express_fee_usd')})"
+    ),
+}
+
+
+def _contract_filter(contract):
+    # Exact match against the registry instead of leading-wildcard `ilike` on every row's string.
+    return f"{contract} IN ({', '.join(repr(a) for a in contract_addresses())})"
+
+
+# Half-open range on the raw timestamp; a cast such as `created_at::date` in the predicate would defeat pruning.
+RANGE_FILTER = "created_at >= %(start)s AND created_at < %(end)s"
+
+_AND = "\n          AND "
+
+# Newest raw timestamp across both fact tables. An unfiltered MAX is answered from micro-partition metadata, so this
+# is cheap enough to run on every freshness check; it can run ahead of the newest Squid event but never behind it.
+WATERMARK_QUERY = """
+SELECT GREATEST(
+    (SELECT max(created_at) FROM axelar.axelscan.fact_transfers),
+    (SELECT max(created_at) FROM axelar.axelscan.fact_gmp)
+) AS "Watermark"
+"""
+
+
+def _branch(expressions, columns, table, contract, ranged):
+    select_list = ",\n            ".join(
+        expressions[c] if expressions[c] == c else f"{expressions[c]} AS {c}" for c in columns
+    )
+    conditions = ["status = 'executed'", "simplified_status = 'received'", _contract_filter(contract)]
+    if ranged:
+        conditions.append(RANGE_FILTER)
+    return f"""
+        SELECT
+            {select_list}
+        FROM {table}
+        WHERE {_AND.join(conditions)}"""
+
+
+# Raw columns of the rows that can reach `axelar_service`, per fact table: what a Parquet snapshot for the `duckdb`
+# backend (`squid.snapshot`) has to hold.
+SNAPSHOT_COLUMNS = {
+    "fact_transfers": ["id", "created_at", "status", "simplified_status", "sender_address", "recipient_address"],
+    "fact_gmp": ["id", "created_at", "status", "simplified_status"],
+}
+
+
+def snapshot_query(table):
+    contract = _TRANSFER_CONTRACT if table == "fact_transfers" else _GMP_CONTRACT
+    conditions = ["status = 'executed'", "simplified_status = 'received'", _contract_filter(contract), RANGE_FILTER]
+    return f"""
+        SELECT {", ".join(SNAPSHOT_COLUMNS[table])}, TO_JSON(data) AS data
+        FROM axelar.axelscan.{table}
+        WHERE {_AND.join(conditions)}"""
+
+
+def events_cte(columns=EVENT_COLUMNS, ranged=False):
+    # Returns `WITH axelar_service AS (...)`; callers may append further CTEs with a leading comma.
+    unknown = set(columns) - set(EVENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown event columns: {sorted(unknown)}")
+    transfers = _branch(_TRANSFER_COLUMNS, columns, "axelar.axelscan.fact_transfers", _TRANSFER_CONTRACT, ranged)
+    gmp = _branch(_GMP_COLUMNS, columns, "axelar.axelscan.fact_gmp", _GMP_CONTRACT, ranged)
+    return f"""WITH axelar_service AS (
+        -- Token Transfers{transfers}
+
+        UNION ALL
+
+        -- GMP{gmp}
+    )"""
@@ -0,0 +1,78 @@
+# --- First-Seen Index ---------------------------------------------------------------------------------------------------
+# user -> date of the user's first Squid bridge, for the "New Bridgors" series. Without a local store the index lives
+# in process memory: the first refresh aggregates the full history once, later refreshes only re-read the tail since
+# the last seen event (minus a lookback for late-executed transfers) and keep the earlier date per user. Given a
+# `squid.result_cache`, the index is saved after each refresh and a new process resumes from it, re-reading only
+# from the day of the saved watermark. With a local store the same index is a persisted table maintained by
+# `EventStore.sync`.
+import threading
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from squid.events import events_cte
+from squid.sql import date_range, to_qmark
+from squid.warehouse import read_pandas
+
+LOOKBACK = timedelta(days=2)
+
+
+def first_seen_query(ranged=False):
+    return f"""
+    {events_cte(["created_at", "user"], ranged=ranged)}
+    SELECT user AS "user", min(created_at) AS "first_seen", max(created_at) AS "last_seen"
+    FROM axelar_service
+    WHERE user IS NOT NULL
+    GROUP BY 1
+    """
+
+
+class FirstSeenIndex:
+    def __init__(self, cache=None, cache_key=None):
+        self._first_seen = pd.Series(dtype="datetime64[ns]")
+        self._watermark = None
+        self._lock = threading.Lock()
+        self._cache = cache
+        self._cache_key = cache_key
+        self._loaded = cache is None
+
+    def _load(self):
+        # Callers hold the lock. The saved copy's covered days are just the day of its watermark, which is resumed
+        # from midnight: the tail re-read is a little wider, and the earlier date per user still wins.
+        self._loaded = True
+        saved = self._cache.load(self._cache_key)
+        if saved is None or not saved[1]:
+            return
+        frame, covered = saved
+        self._first_seen = pd.Series(frame["first_seen"].astype("datetime64[ns]").to_numpy(), index=frame["user"])
+        self._watermark = max(covered).to_pydatetime()
+
+    def refresh(self, lookback=LOOKBACK):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            since = None if self._watermark is None else self._watermark - lookback
+            query, params = to_qmark(
+                first_seen_query(ranged=since is not None),
+                {"start": since, "end": datetime.now() + timedelta(days=1)},
+            )
+            tail = read_pandas(query, params)
+            if tail.empty:
+                return len(self._first_seen)
+            first_seen = pd.Series(
+                pd.to_datetime(tail["first_seen"]).dt.normalize().astype("datetime64[ns]").to_numpy(), index=tail["user"]
+            )
+            self._first_seen = pd.concat([self._first_seen, first_seen]).groupby(level=0).min()
+            last_seen = pd.to_datetime(tail["last_seen"]).max().to_pydatetime()
+            self._watermark = last_seen if self._watermark is None else max(self._watermark, last_seen)
+            if self._cache is not None:
+                frame = pd.DataFrame({"user": self._first_seen.index, "first_seen": self._first_seen.to_numpy()})
+                self._cache.save(self._cache_key, frame, [pd.Timestamp(self._watermark).normalize()])
+            return len(self._first_seen)
+
+    def new_users(self, start_date, end_date):
+        bounds = date_range(start_date, end_date)
+        first_seen = self._first_seen
+        first_seen = first_seen[(first_seen >= bounds["start"]) & (first_seen < bounds["end"])]
+        counts = first_seen.value_counts().sort_index()
+        return pd.DataFrame({"Date": counts.index, "New Bridgors": counts.to_numpy()})
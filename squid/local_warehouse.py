@@ -0,0 +1,122 @@
+# --- Local Warehouse Stand-In -------------------------------------------------------------------------------------------
+# A DuckDB database shaped like the two Snowflake fact tables the app reads (`axelar.axelscan.fact_transfers` and
+# `fact_gmp`, with the VARIANT `data` column as JSON), behind the small part of the Snowflake cursor API that
+# `squid.warehouse` uses. Queries are written in Snowflake dialect and transpiled with sqlglot; the few functions it
+# leaves untranslated are provided as DuckDB macros. Serves the `duckdb` backend (`squid.backend`) and the
+# offline benchmark (`squid.bench`).
+#
+# The tables are either empty in-memory tables or views over Parquet files such as those `squid.synthetic` writes
+# (`<dir>/fact_transfers.parquet`, `<dir>/fact_gmp.parquet`); views re-read and re-parse the JSON on every query, much
+# like a warehouse scan.
+import itertools
+import os
+from functools import lru_cache
+
+import duckdb
+import pyarrow as pa
+import sqlglot
+from sqlglot import exp
+
+_CATALOG = """
+ATTACH IF NOT EXISTS ':memory:' AS axelar;
+CREATE SCHEMA IF NOT EXISTS axelar.axelscan;
+"""
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS axelar.axelscan.fact_transfers (
+    id                VARCHAR,
+    created_at        TIMESTAMP,
+    status            VARCHAR,
+    simplified_status VARCHAR,
+    sender_address    VARCHAR,
+    recipient_address VARCHAR,
+    data              JSON
+);
+CREATE TABLE IF NOT EXISTS axelar.axelscan.fact_gmp (
+    id                VARCHAR,
+    created_at        TIMESTAMP,
+    status            VARCHAR,
+    simplified_status VARCHAR,
+    data              JSON
+);
+"""
+
+# Snowflake functions without a sqlglot translation to DuckDB.
+_SHIMS = """
+CREATE OR REPLACE MACRO is_object(v) AS json_type(v) = 'OBJECT';
+CREATE OR REPLACE MACRO is_array(v) AS json_type(v) = 'ARRAY';
+CREATE OR REPLACE MACRO try_to_double(v) AS TRY_CAST(v AS DOUBLE);
+"""
+
+_VIEW = "CREATE OR REPLACE VIEW axelar.axelscan.{table} AS SELECT * REPLACE (CAST(data AS JSON) AS data) FROM read_parquet('{path}')"
+
+_BATCH_ROWS = 1 << 17
+
+
+def _unquote_variant_strings(node):
+    # `data:path::STRING` is the bare string in Snowflake, but casting DuckDB JSON to text keeps the quotes;
+    # `->>` extracts the unquoted value instead.
+    if isinstance(node, exp.Cast) and isinstance(node.this, exp.JSONExtract) and node.to.is_type(*exp.DataType.TEXT_TYPES):
+        return exp.JSONExtractScalar(this=node.this.this, expression=node.this.expression)
+    return node
+
+
+@lru_cache(maxsize=256)
+def to_duckdb(query):
+    # Snowflake-dialect query text (with `?` placeholders) -> DuckDB. Loader SQL is byte-stable, so this is cached.
+    return ";\n".join(
+        tree.transform(_unquote_variant_strings).sql(dialect="duckdb")
+        for tree in sqlglot.parse(query, read="snowflake")
+        if tree is not None
+    )
+
+
+class LocalWarehouse:
+    def __init__(self, path=":memory:", parquet_dir=None):
+        self.db = duckdb.connect(path)
+        self.db.execute(_CATALOG)
+        if parquet_dir is None:
+            self.db.execute(_TABLES)
+        else:
+            for table in ("fact_transfers", "fact_gmp"):
+                file = os.path.abspath(os.path.join(parquet_dir, f"{table}.parquet")).replace("'", "''")
+                self.db.execute(_VIEW.format(table=table, path=file))
+        self.db.execute(_SHIMS)
+        self._ids = itertools.count(1)
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        self.db.close()
+
+
+class _Cursor:
+    # The subset of `snowflake.connector` cursor methods `squid.warehouse` calls.
+    def __init__(self, warehouse):
+        self._warehouse = warehouse
+        self._cur = warehouse.db.cursor()
+        self._result = None
+        self.sfqid = None
+
+    def execute(self, query, params=None):
+        self._result = self._cur.execute(to_duckdb(query), params or None)
+        self.sfqid = f"local-{next(self._warehouse._ids)}"
+        return self
+
+    def fetchone(self):
+        return self._result.fetchone()
+
+    def fetch_arrow_all(self, force_return_table=False):
+        return self._result.fetch_arrow_table()
+
+    def fetch_arrow_batches(self):
+        reader = self._result.fetch_record_batch(_BATCH_ROWS)
+        for batch in reader:
+            yield pa.Table.from_batches([batch])
+
+    def close(self):
+        self._cur.close()
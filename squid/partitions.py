@@ -0,0 +1,132 @@
+# --- Daily Partition Cache ----------------------------------------------------------------------------------------------
+# `st.cache_data` keys on the exact (start_date, end_date) pair, so nudging a date picker by one day is a full miss.
+# Loaders whose rows are day-level additive aggregates go through a named `DailyPartitions` instead: it remembers
+# which days it already holds (per loader parameters, e.g. the selected chain) and for any requested range fetches
+# only the missing span, then answers from the union of cached and new rows.
+#
+# Days older than the data watermark (`as_of`, see `squid.source.data_as_of`) minus `OPEN_DAYS` are closed and kept
+# for the life of the process. Open days are never retained across watermarks: with an `as_of` they are held until
+# it moves, without one they are re-fetched on every call.
+# Partition sets created with a `version` also persist their closed days to the on-disk `squid.result_cache`.
+import threading
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from squid.result_cache import DEFAULT_MAX_MB, DEFAULT_PATH, ResultCache
+
+# Days this close to the watermark may still gain late-executed rows (see `store.SYNC_LOOKBACK`), so they are served
+# but never retained.
+OPEN_DAYS = 2
+
+# Each contiguous run of missing days is one query; more fragmented gaps than this collapse into a single span.
+MAX_SPANS = 3
+
+
+def _days(values):
+    return pd.to_datetime(values).dt.normalize().astype("datetime64[ns]")
+
+
+def _spans(missing):
+    breaks = [0, *(i for i in range(1, len(missing)) if missing[i] - missing[i - 1] > pd.Timedelta(days=1)), len(missing)]
+    if len(breaks) - 1 > MAX_SPANS:
+        return [(missing[0], missing[-1])]
+    return [(missing[a], missing[b - 1]) for a, b in zip(breaks, breaks[1:])]
+
+
+class DailyPartitions:
+    def __init__(self, date_column="Date", cache=None, cache_key=None):
+        self.date_column = date_column
+        self._lock = threading.Lock()
+        self._parts = {}
+        self._tails = {}
+        self._fetching = {}
+        self._cache = cache
+        self._cache_key = cache_key
+
+    def _held(self, key):
+        # Callers hold the lock. A parameter set not seen by this process yet starts from its persisted copy.
+        if key not in self._parts and self._cache is not None:
+            self._parts[key] = self._cache.load([self._cache_key, key]) or (None, frozenset())
+        return self._parts.get(key, (None, frozenset()))
+
+    def _tail(self, key, as_of):
+        # Callers hold the lock. Open days fetched under this exact watermark.
+        held = self._tails.get(key)
+        if as_of is None or held is None or held[0] != as_of:
+            return None, frozenset()
+        return held[1], held[2]
+
+    def _fetch_lock(self, key):
+        # Fetches for one parameter set queue behind each other, so sessions missing the same days query them once.
+        with self._lock:
+            return self._fetching.setdefault(key, threading.Lock())
+
+    def get(self, fetch, start_date, end_date, as_of=None, **params):
+        # `fetch(start_date, end_date, **params)` returns day-level rows for an inclusive date range. Without an
+        # `as_of` watermark the open tail is counted back from today. The partition set lock is only held to read
+        # and merge, never across a fetch, so a slow query only holds up callers missing days of the same parameters.
+        key = tuple(sorted(params.items()))
+        requested = pd.date_range(start_date, end_date, freq="D")
+        if requested.empty:
+            return fetch(start_date, end_date, **params)
+        closed = pd.Timestamp(as_of or date.today()).normalize() - pd.Timedelta(days=OPEN_DAYS)
+        with self._lock:
+            frame, covered = self._held(key)
+            tail, opened = self._tail(key, as_of)
+        missing = requested[~requested.isin(list(covered | opened))]
+        fresh = None
+        if len(missing):
+            with self._fetch_lock(key):
+                # Whoever held the fetch lock before may have merged some of these days.
+                with self._lock:
+                    frame, covered = self._held(key)
+                    tail, opened = self._tail(key, as_of)
+                missing = requested[~requested.isin(list(covered | opened))]
+                if len(missing):
+                    # Rows a collapsed span returns for days already held are dropped.
+                    spans = _spans(missing)
+                    fresh = pd.concat([fetch(a.date(), b.date(), **params) for a, b in spans], ignore_index=True)
+                    fresh = fresh.assign(**{self.date_column: _days(fresh[self.date_column])})
+                    fresh = fresh[fresh[self.date_column].isin(missing)]
+                    newly_closed = frozenset(missing[missing < closed])
+                    newly_opened = frozenset(missing[missing >= closed])
+                    with self._lock:
+                        if newly_closed:
+                            frame, covered = self._held(key)
+                            kept = fresh[fresh[self.date_column].isin(newly_closed)]
+                            frame = kept if frame is None else pd.concat([frame, kept], ignore_index=True)
+                            covered = covered | newly_closed
+                            self._parts[key] = (frame, covered)
+                            if self._cache is not None:
+                                self._cache.save([self._cache_key, key], frame, covered)
+                        if newly_opened and as_of is not None:
+                            tail, opened = self._tail(key, as_of)
+                            kept = fresh[fresh[self.date_column].isin(newly_opened)]
+                            tail = kept if tail is None else pd.concat([tail, kept], ignore_index=True)
+                            self._tails[key] = (as_of, tail, opened | newly_opened)
+
+        parts = []
+        for held in (frame, tail):
+            if held is not None:
+                held = held[held[self.date_column].between(requested[0], requested[-1])]
+                parts.append(held if fresh is None else held[~held[self.date_column].isin(missing)])
+        if fresh is not None:
+            parts.append(fresh)
+        return pd.concat(parts, ignore_index=True).sort_values(self.date_column, ignore_index=True)
+
+
+@st.cache_resource(show_spinner=False)
+def result_cache():
+    settings = st.secrets.get("cache") or {}
+    if not settings.get("enabled", True):
+        return None
+    return ResultCache(settings.get("path", DEFAULT_PATH), int(settings.get("max_mb", DEFAULT_MAX_MB)) << 20)
+
+
+@st.cache_resource(show_spinner=False)
+def daily_partitions(name, date_column="Date", version=None):
+    # One partition set per loader, shared by every session of this server process. `version` fingerprints the
+    # loader's SQL (`squid.result_cache.fingerprint`); with it, closed days are also kept on disk.
+    return DailyPartitions(date_column, result_cache() if version is not None else None, [name, version])
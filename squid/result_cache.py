@@ -0,0 +1,90 @@
+# --- Persistent Result Cache --------------------------------------------------------------------------------------------
+# In-memory caches die with the process, so after every deploy or restart the first visitors would re-run the full
+# history scans. Daily partitions therefore also write their closed days to Parquet files under `data/result_cache`
+# (configurable in secrets: `[cache] path = "..."`, `max_mb = 512`, `enabled = false`), read back lazily the first
+# time a partition set is used.
+#
+# A file is keyed by the partition name, its loader parameters and a fingerprint of the SQL that produced it, so
+# editing a query (or the contract registry it embeds) orphans the old files instead of serving them. Orphans and
+# cold entries are evicted least-recently-used first once the directory exceeds its size budget.
+import hashlib
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_PATH = "data/result_cache"
+DEFAULT_MAX_MB = 512
+
+# Bump to orphan every file when the on-disk layout changes.
+FORMAT_VERSION = 1
+
+_COVERED = b"squid.covered"
+
+
+def fingerprint(*parts):
+    # Whitespace-insensitive hash of query text, so reindenting a query keeps its cached results.
+    text = "\n".join(re.sub(r"\s+", " ", str(part)).strip() for part in parts)
+    return hashlib.sha1(f"{FORMAT_VERSION}\n{text}".encode()).hexdigest()[:16]
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_MB << 20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{fingerprint(json.dumps(key, default=str))}.parquet")
+
+    def load(self, key):
+        # Returns (frame, covered days) or None; a file that cannot be read is treated as a miss and dropped.
+        file = self._file(key)
+        try:
+            table = pq.read_table(file)
+            os.utime(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, pa.ArrowException):
+            self._remove(file)
+            return None
+        covered = json.loads((table.schema.metadata or {}).get(_COVERED, b"[]"))
+        return table.to_pandas(), frozenset(pd.to_datetime(covered))
+
+    def save(self, key, frame, covered):
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        days = sorted(day.strftime("%Y-%m-%d") for day in covered)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _COVERED: json.dumps(days).encode()})
+        file = self._file(key)
+        with self._lock:
+            # Written aside and renamed, so a concurrent reader or a crash never sees a partial file.
+            partial = f"{file}.{threading.get_ident()}.tmp"
+            pq.write_table(table, partial)
+            os.replace(partial, file)
+            self._evict(keep=file)
+
+    def _evict(self, keep):
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(".parquet"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if file != keep:
+                self._remove(file)
+                total -= size
+
+    @staticmethod
+    def _remove(file):
+        try:
+            os.remove(file)
+        except FileNotFoundError:
+            pass
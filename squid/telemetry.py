@@ -0,0 +1,154 @@
+# --- Loader Telemetry ---------------------------------------------------------------------------------------------------
+# Every loader is declared with `cached_loader(...)` instead of bare `st.cache_data(...)`, or with `traced_loader`
+# when it is deliberately not cached: same caching, plus one record per call with wall time, time spent in backend
+# queries, rows returned, bytes fetched, the Snowflake query IDs it ran and whether it was a cache hit. Queries are
+# reported by the fetch layer (`squid.warehouse`, `EventStore.read_sql`) to whichever loader is running on the
+# calling thread; nested loaders roll their fetch time up into the caller. Records live in bounded per-process ring
+# buffers read by the Diagnostics page.
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+# Most recent loader calls and queries kept per server process.
+CAPACITY = 2000
+
+_calls = deque(maxlen=CAPACITY)
+_queries = deque(maxlen=CAPACITY)
+_local = threading.local()
+
+
+def _page(path):
+    # "pages/2_🚧By_Routes.py" -> "By Routes"; loaders defined under `squid/` belong to the page that calls them.
+    if os.path.basename(os.path.dirname(path)) != "pages":
+        return None
+    name = re.sub(r"^\d+_", "", os.path.splitext(os.path.basename(path))[0])
+    return re.sub(r"^\W+", "", name).replace("_", " ")
+
+
+class _Span:
+    def __init__(self, loader, page, parent):
+        self.loader = loader
+        self.page = page or (parent.page if parent else "-")
+        self.parent = parent
+        self.hit = True
+        self.fetch = 0.0
+        self.bytes = 0
+        self.query_ids = []
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _record(func, page, run, args, kwargs):
+    stack = _stack()
+    span = _Span(func.__name__, page or _page(sys._getframe(2).f_code.co_filename), stack[-1] if stack else None)
+    stack.append(span)
+    started = time.perf_counter()
+    try:
+        value = run(span, *args, **kwargs)
+    finally:
+        stack.pop()
+    wall = time.perf_counter() - started
+    if span.parent is not None:
+        span.parent.fetch += span.fetch
+        span.parent.bytes += span.bytes
+        span.parent.query_ids.extend(span.query_ids)
+    _calls.append({
+        "At": datetime.now(),
+        "Page": span.page,
+        "Loader": span.loader,
+        "Caller": span.parent.loader if span.parent else None,
+        "Wall (s)": wall,
+        "Fetch (s)": span.fetch,
+        "Rows": len(value) if hasattr(value, "__len__") else None,
+        "Bytes Fetched": span.bytes,
+        "Query IDs": list(span.query_ids),
+        "Cache Hit": span.hit,
+    })
+    return value
+
+
+def cached_loader(**cache_args):
+    def decorate(func):
+        page = _page(func.__code__.co_filename)
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            # Only runs on a cache miss.
+            _stack()[-1].hit = False
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(**cache_args)(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            return _record(func, page, lambda span, *a, **k: cached(*a, **k), args, kwargs)
+
+        call.clear = cached.clear
+        return call
+
+    return decorate
+
+
+def traced_loader(func):
+    # Same record as `cached_loader` for a loader that is not cached itself (it reads from state that already is);
+    # it counts as a hit when it ran no backend query.
+    page = _page(func.__code__.co_filename)
+
+    def run(span, *args, **kwargs):
+        value = func(*args, **kwargs)
+        span.hit = not span.query_ids and span.fetch == 0
+        return value
+
+    @functools.wraps(func)
+    def call(*args, **kwargs):
+        return _record(func, page, run, args, kwargs)
+
+    return call
+
+
+def record_query(seconds, rows, nbytes, query_id=None):
+    # Called by the fetch layer once a query's result is complete.
+    stack = _stack()
+    span = stack[-1] if stack else None
+    if span is not None:
+        span.fetch += seconds
+        span.bytes += nbytes
+        if query_id:
+            span.query_ids.append(query_id)
+    _queries.append({
+        "At": datetime.now(),
+        "Page": span.page if span else "-",
+        "Loader": span.loader if span else None,
+        "Seconds": seconds,
+        "Rows": rows,
+        "Bytes Fetched": nbytes,
+        "Query ID": query_id,
+    })
+
+
+# --- Read Side ----------------------------------------------------------------------------------------------------------
+def calls():
+    return pd.DataFrame(list(_calls), columns=[
+        "At", "Page", "Loader", "Caller", "Wall (s)", "Fetch (s)", "Rows", "Bytes Fetched", "Query IDs", "Cache Hit",
+    ])
+
+
+def queries():
+    return pd.DataFrame(list(_queries), columns=["At", "Page", "Loader", "Seconds", "Rows", "Bytes Fetched", "Query ID"])
+
+
+def clear():
+    _calls.clear()
+    _queries.clear()
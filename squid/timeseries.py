@@ -0,0 +1,40 @@
+# --- Timeframe Roll-Ups -------------------------------------------------------------------------------------------------
+# Time-series loaders fetch day-level aggregates once (their cache key carries no timeframe) and the page rolls them
+# up to the selected week / month here, so switching "Select Time Frame" never goes back to the warehouse. Buckets
+# match `date_trunc`: weeks start on Monday, months on the 1st.
+import pandas as pd
+
+from squid.sketches import estimate
+
+TIMEFRAMES = ("month", "week", "day")
+
+
+def timeframe_unit(timeframe):
+    unit = str(timeframe).lower()
+    if unit not in TIMEFRAMES:
+        raise ValueError(f"Unsupported timeframe {timeframe!r}; expected one of {TIMEFRAMES}")
+    return unit
+
+
+def truncate(dates, timeframe):
+    unit = timeframe_unit(timeframe)
+    days = pd.to_datetime(dates).dt.normalize().astype("datetime64[ns]")
+    if unit == "week":
+        return days - pd.to_timedelta(days.dt.weekday, unit="D")
+    if unit == "month":
+        return days - pd.to_timedelta(days.dt.day - 1, unit="D")
+    return days
+
+
+def rollup(daily, timeframe, keys=(), date_column="Date"):
+    # Sums every non-key column per bucket, so `daily` must hold additive measures only (counts, sums);
+    # ratios and running totals are derived after the roll-up.
+    df = daily.assign(**{date_column: truncate(daily[date_column], timeframe)})
+    # NULL keys are a bucket of their own, as in a SQL GROUP BY and `squid.cube.totals`.
+    return df.groupby([date_column, *keys], as_index=False, sort=True, dropna=False).sum()
+
+
+def rollup_distinct(sketches, timeframe, keys=(), date_column="Date", name="Distinct"):
+    # Distinct counts cannot be summed across days; per-day sketches are merged per bucket instead.
+    df = sketches.assign(**{date_column: truncate(sketches[date_column], timeframe)})
+    return estimate(df, [date_column, *keys], name)
@@ -0,0 +1,43 @@
+# --- Warehouse Result Fetching ------------------------------------------------------------------------------------------
+# Results come back as Arrow record batches and are turned into DataFrames column-wise, instead of the DBAPI
+# row-tuple path behind `pd.read_sql`. Large results can be streamed batch by batch. Queries go to the backend
+# selected in secrets (`squid.backend`).
+import time
+
+from squid.backend import get_backend
+from squid.telemetry import record_query
+
+
+def _connection():
+    return get_backend()
+
+
+def read_arrow(query, params=None):
+    cur = _connection().cursor()
+    try:
+        started = time.perf_counter()
+        cur.execute(query, params)
+        # An empty result still comes back as a table so callers can index its columns.
+        table = cur.fetch_arrow_all(force_return_table=True)
+        record_query(time.perf_counter() - started, table.num_rows, table.nbytes, cur.sfqid)
+        return table
+    finally:
+        cur.close()
+
+
+def read_pandas(query, params=None):
+    return read_arrow(query, params).to_pandas()
+
+
+def iter_arrow_batches(query, params=None):
+    cur = _connection().cursor()
+    started, rows, nbytes = time.perf_counter(), 0, 0
+    try:
+        cur.execute(query, params)
+        for batch in cur.fetch_arrow_batches():
+            rows, nbytes = rows + batch.num_rows, nbytes + batch.nbytes
+            yield batch
+        # Includes the time the consumer spends on each batch.
+        record_query(time.perf_counter() - started, rows, nbytes, cur.sfqid)
+    finally:
+        cur.close()
@@ -0,0 +1,62 @@
+# --- Cache Warm-Up ------------------------------------------------------------------------------------------------------
+# Precomputes the data behind every page's default view (`squid.defaults`) so the first visitors after a deploy do
+# not pay for the history scans. Every page loader is a slice of the analytics cube or reads the first-seen index,
+# so warming means filling the cube partitions for the default ranges and building the index: from the warehouse
+# both land in the on-disk result cache the server reads at startup; with a local store this syncs it and rebuilds
+# its cube tail. Asset and chain selections are sliced client-side and need no fetch of their own.
+#
+# Usage:  python -m squid.warmup [workers]      (run from the app directory, before `streamlit run`)
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from squid.cube import MEASURE_GRAINS, USER_GRAINS
+from squid.defaults import DEFAULT_RANGES
+from squid.source import data_as_of, load_cube, load_cube_users, new_bridgors
+
+# Every cube relation (`squid.cube`) and the first-seen index; together they back every page.
+LOADERS = {
+    **{f"cube.{grain}": partial(load_cube, grain) for grain in MEASURE_GRAINS},
+    **{f"users.{grain}": partial(load_cube_users, grain) for grain in USER_GRAINS},
+    "first_seen": new_bridgors,
+}
+
+
+def _timed(loader, *args):
+    started = time.perf_counter()
+    rows = len(loader(*args))
+    return rows, time.perf_counter() - started
+
+
+def warm(workers=4):
+    # Returns one (loader, start, end, rows, seconds) row per job; raises the first loader error after all finish.
+    started = time.perf_counter()
+    as_of = data_as_of()
+    print(f"watermark {as_of} ({time.perf_counter() - started:.1f}s)")
+
+    # Widest range first: narrower ones waiting on the same partition set are then answered from it.
+    ranges = sorted(set(DEFAULT_RANGES.values()), key=lambda r: r[0] - r[1])
+    jobs = [(name, loader, start, end) for start, end in ranges for name, loader in LOADERS.items()]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="squid-warmup") as pool:
+        futures = [(name, start, end, pool.submit(_timed, loader, start, end, as_of)) for name, loader, start, end in jobs]
+
+    timings, errors = [], []
+    for name, start, end, future in futures:
+        try:
+            rows, seconds = future.result()
+        except Exception as e:
+            errors.append(e)
+            print(f"{name:<24} {start} .. {end}  FAILED: {e}")
+            continue
+        timings.append((name, start, end, rows, seconds))
+        print(f"{name:<24} {start} .. {end}  {rows:>10,} rows  {seconds:7.1f}s")
+    print(f"warmed {len(timings)}/{len(jobs)} loaders in {time.perf_counter() - started:.1f}s")
+    if errors:
+        raise errors[0]
+    return timings
+
+
+if __name__ == "__main__":
+    # A failed loader raises out of `warm`, so the traceback is printed and the exit status is non-zero.
+    warm(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -92,6 +92,9 @@ st.markdown(
 st.sidebar.markdown(
     """
     <style>
+    [data-testid="stSidebarNav"] li:has(a[href$="/Diagnostics"]) {
+        display: none;
+    }
     .sidebar-footer {
         position: fixed;
         bottom: 20px;